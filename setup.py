@@ -8,10 +8,15 @@ setup(
     install_requires=[
         "requests>=2.25.0",
     ],
+    extras_require={
+        "async": ["aiohttp>=3.8"],
+        "http2": ["httpx[http2]>=0.23"],
+        "speedups": ["orjson>=3.0"],
+    },
     entry_points={
         'console_scripts': [
             'paraloader=cli:main',
         ],
     },
-    python_requires=">=3.6",
+    python_requires=">=3.7",
 )
\ No newline at end of file
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import argparse
+import asyncio
 import sys
 import os
 import logging
@@ -8,6 +9,7 @@ import logging
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from core.download_manager import DownloadManager
+from core.async_downloader import AsyncDownloader
 
 
 def setup_logging(verbose: bool):
@@ -39,6 +41,19 @@ def main():
         default=4,
         help='Number of parallel connections (default: 4)'
     )
+    # The async engine has its own aiohttp client, so it can't use HTTP/2
+    engine = parser.add_mutually_exclusive_group()
+    engine.add_argument(
+        '--async',
+        dest='use_async',
+        action='store_true',
+        help='Use the single-threaded asyncio engine (requires aiohttp)'
+    )
+    engine.add_argument(
+        '--http2',
+        action='store_true',
+        help='Multiplex all chunks over one HTTP/2 connection (requires httpx[http2])'
+    )
     parser.add_argument(
         '-v', '--verbose',
         action='store_true',
@@ -55,18 +70,27 @@ def main():
         print(f"Connections: {args.connections}")
         print("Press Ctrl+C to stop...")
 
-        downloader = DownloadManager(
-            url=args.url,
-            output_path=args.output,
-            num_connections=args.connections
-        )
+        if args.use_async:
+            downloader = AsyncDownloader(
+                url=args.url,
+                output_path=args.output,
+                num_connections=args.connections
+            )
+            if not asyncio.run(downloader.run()):
+                print("❌ Download failed")
+                return 1
+        else:
+            downloader = DownloadManager(
+                url=args.url,
+                output_path=args.output,
+                num_connections=args.connections,
+                http2=args.http2
+            )
 
-        downloader.start_download()
+            downloader.start_download()
 
-        # Wait for completion
-        while downloader.is_downloading:
-            import time
-            time.sleep(1)
+            # Wait for completion
+            downloader.done.wait()
 
         # Check if file was actually downloaded
         if os.path.exists(args.output) and os.path.getsize(args.output) > 0:
@@ -80,7 +104,7 @@ def main():
 
     except KeyboardInterrupt:
         print("\n🛑 Stopping download...")
-        if 'downloader' in locals():
+        if 'downloader' in locals() and isinstance(downloader, DownloadManager):
             downloader.stop_download()
     except Exception as e:
         logging.error(f"Download failed: {e}")
@@ -0,0 +1,206 @@
+import asyncio
+import logging
+from typing import Optional
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency, only needed for the async engine
+    aiohttp = None
+
+from core.chunk_manager import ChunkManager
+from network.range_request import (DEFAULT_HEADERS, range_headers, range_length, file_size_from_head,
+                                   check_range_response)
+from utils.file_ops import FileValidator, OutputFile, pwritev
+from utils.validators import URLValidator, validate_connections_count, validate_chunk_size
+from utils.config import ConfigManager
+
+
+class AsyncDownloader:
+    """
+    Single-threaded alternative to DownloadManager.
+    One asyncio event loop multiplexes every range request over an aiohttp
+    connection pool, so no worker threads or cross-thread locking are needed.
+    """
+
+    MAX_IOVECS = 256  # Well below IOV_MAX on every platform
+
+    def __init__(self,
+                 url: str,
+                 output_path: str,
+                 num_connections: int = 4,
+                 chunk_size: int = 1024 * 1024,
+                 config_file: str = "config.json"):
+
+        if aiohttp is None:
+            raise RuntimeError("The async engine requires aiohttp: pip install aiohttp")
+
+        # Input validation
+        if not URLValidator().is_valid_url(url):
+            raise ValueError(f"Invalid URL: {url}")
+
+        if not validate_connections_count(num_connections):
+            raise ValueError(f"Invalid number of connections: {num_connections}")
+
+        if not validate_chunk_size(chunk_size):
+            raise ValueError(f"Invalid chunk size: {chunk_size}")
+
+        FileValidator.ensure_directory_exists(output_path)
+
+        self.url = url
+        self.output_path = output_path
+        self.output = OutputFile(output_path)
+        self.num_connections = num_connections
+        self.chunk_size = chunk_size
+
+        self.config = ConfigManager(config_file)
+        self.timeout = self.config.get('timeout', 30)
+        self.buffer_size = self.config.get('buffer_size', 1024 * 1024)
+
+        self.chunk_manager: Optional[ChunkManager] = None
+        self.last_logged_progress = -1
+        self._writes = set()  # Executor writes that haven't finished yet
+
+        self.logger = logging.getLogger(__name__)
+
+    async def run(self) -> bool:
+        """Download the file, returns True if it was written completely"""
+        connector = aiohttp.TCPConnector(limit=self.num_connections)
+        timeout = aiohttp.ClientTimeout(sock_connect=self.timeout, sock_read=self.timeout)
+
+        try:
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                             headers=DEFAULT_HEADERS, auto_decompress=False) as session:
+                file_size = await self._get_file_size(session)
+                if not file_size:
+                    self.logger.info("Server doesn't support parallel downloads, using single connection")
+                    self.output.open()
+                    success = await self._fetch(session, 0, None) is not None
+                else:
+                    self.output.open(file_size)
+                    self.chunk_manager = ChunkManager(
+                        total_size=file_size,
+                        chunk_size=self.chunk_size,
+                        num_connections=self.num_connections
+                    )
+                    self.logger.info(f"Starting async download with {self.num_connections} connections")
+                    self.logger.info(f"File size: {file_size} bytes")
+
+                    workers = [
+                        asyncio.ensure_future(self._worker(session, worker_id))
+                        for worker_id in range(self.num_connections)
+                    ]
+                    try:
+                        await asyncio.gather(*workers)
+                    finally:
+                        # A permanently failed chunk dooms the download, stop the other streams
+                        for worker in workers:
+                            worker.cancel()
+                        await asyncio.gather(*workers, return_exceptions=True)
+                    success = self.chunk_manager.all_chunks_completed()
+
+            if success:
+                self.output.finalize()
+                self.logger.info(f"Download completed: {self.output_path}")
+            return success
+
+        except Exception as e:
+            self.logger.error(f"Download process failed: {e}")
+            return False
+        finally:
+            # Cancelling a worker doesn't stop a pwritev already running on the
+            # executor, so let those finish before their fd is closed
+            if self._writes:
+                await asyncio.wait(list(self._writes))
+            self.output.close()
+
+    async def _get_file_size(self, session) -> Optional[int]:
+        """Check if server supports range requests and get file size"""
+        try:
+            async with session.head(self.url, allow_redirects=True) as response:
+                response.raise_for_status()
+                return file_size_from_head(response.headers)
+
+        except Exception as e:
+            self.logger.error(f"Error getting file info: {e}")
+            return None
+
+    async def _worker(self, session, worker_id: int):
+        """Keep pulling chunks until none are left - one coroutine per connection"""
+        while True:
+            chunk_range = self.chunk_manager.get_next_range(self.chunk_size, worker_id)
+            if not chunk_range:
+                return
+
+            chunk_ids, start, end = chunk_range
+            if await self._fetch(session, start, end) == end - start + 1:
+                for chunk_id in chunk_ids:
+                    self.chunk_manager.mark_chunk_completed(chunk_id)
+                self._report_progress()
+            else:
+                for chunk_id in chunk_ids:
+                    self.chunk_manager.mark_chunk_failed(chunk_id)
+                if self.chunk_manager.failed_count:
+                    raise RuntimeError(f"{self.chunk_manager.failed_count} chunk(s) failed after all retries")
+
+    async def _fetch(self, session, start_byte: int, end_byte: Optional[int]) -> Optional[int]:
+        """
+        Download a byte range straight into the output file at its offset.
+        Returns the number of bytes written, or None if the request failed.
+        """
+        try:
+            async with session.get(self.url, headers=range_headers(start_byte, end_byte)) as response:
+                response.raise_for_status()
+                if not check_range_response(response.status, response.headers, start_byte, end_byte):
+                    return None
+
+                # Socket reads arrive in small pieces, batch them into one
+                # vectored write per buffer_size bytes. The write runs on the
+                # default executor so a slow disk never stalls the other streams.
+                # Never write past the range: surplus bytes would land in other chunks
+                loop = asyncio.get_event_loop()
+                offset = start_byte
+                remaining = range_length(start_byte, end_byte)
+                pending = []
+                pending_size = 0
+                async for data in response.content.iter_chunked(self.buffer_size):
+                    data = data[:remaining]
+                    remaining -= len(data)
+                    pending.append(data)
+                    pending_size += len(data)
+                    if not remaining:
+                        break
+                    if pending_size >= self.buffer_size or len(pending) == self.MAX_IOVECS:
+                        await self._write(loop, pending, offset)
+                        offset += pending_size
+                        pending = []
+                        pending_size = 0
+
+                if pending:
+                    await self._write(loop, pending, offset)
+                    offset += pending_size
+
+            return offset - start_byte
+
+        except asyncio.CancelledError:
+            raise  # Still an Exception before Python 3.8, never swallow it
+        except Exception as e:
+            self.logger.error(f"Download failed: {e}")
+            return None
+
+    async def _write(self, loop, buffers, offset: int):
+        """
+        Write buffers at offset on the default executor.
+        The write is shielded, so cancelling the caller leaves it tracked in
+        self._writes until the thread running it is done.
+        """
+        write = loop.run_in_executor(None, pwritev, self.output.fd, buffers, offset)
+        self._writes.add(write)
+        write.add_done_callback(self._writes.discard)
+        await asyncio.shield(write)
+
+    def _report_progress(self):
+        """Log progress whenever the whole-percent value changes"""
+        progress = int(self.chunk_manager.get_progress())
+        if progress != self.last_logged_progress:
+            self.last_logged_progress = progress
+            self.logger.info(f"Download progress: {progress}%")
@@ -1,5 +1,6 @@
 import threading
 import os
+from collections import deque
 from typing import List, Tuple, Optional
 import logging
 
@@ -15,76 +16,111 @@ class ChunkManager:
         self.chunk_size = chunk_size
         self.num_connections = num_connections
         self.chunks: List[Tuple[int, int]] = []
-        self.completed_chunks = set()
-        self.failed_chunks = set()
+        self.failed_chunks = set()  # Chunks that exhausted their retries
+        # Plain int counters, only written under self.lock and read without it
+        self.completed_count = 0
+        self.failed_count = 0
+        self.in_progress = set()
         self.lock = threading.Lock()  # SYNCHRONIZATION primitive
+        self.completion_cv = threading.Condition(self.lock)  # Signalled on every chunk result
         self.retry_count = {}
         self.max_retries = 3
 
         self._calculate_chunks()
 
+        # WORK STEALING: every worker owns a contiguous slice of the chunks and
+        # pops from the front of its own deque; idle workers steal from the
+        # back of the busiest peer. Single deque operations are atomic under
+        # the GIL, so claiming work takes no lock.
+        num_chunks = len(self.chunks)
+        self.local_queues: List[deque] = [
+            deque(range(num_chunks * w // num_connections, num_chunks * (w + 1) // num_connections))
+            for w in range(num_connections)
+        ]
+
     def _calculate_chunks(self):
         """Calculate byte ranges for each chunk - demonstrates work division"""
-        chunk_ranges = []
-        for i in range(self.num_connections):
-            start = i * self.chunk_size
-            end = start + self.chunk_size - 1
-
-            # Ensure we don't go beyond file size
-            if end >= self.total_size:
-                end = self.total_size - 1
-
-            # Last chunk gets any remaining bytes
-            if i == self.num_connections - 1:
-                end = self.total_size - 1
-
-            if start < self.total_size:
-                chunk_ranges.append((start, end))
-
-        self.chunks = chunk_ranges
+        num_chunks = (self.total_size + self.chunk_size - 1) // self.chunk_size
+        self.chunks = [
+            (i * self.chunk_size, min((i + 1) * self.chunk_size, self.total_size) - 1)
+            for i in range(num_chunks)
+        ]
 
-    def get_next_chunk(self) -> Optional[Tuple[int, int, int]]:
+    def get_next_range(self, max_bytes: int, worker_id: int = 0) -> Optional[Tuple[List[int], int, int]]:
         """
-        Thread-safe method to get next chunk for processing.
+        Claim a run of adjacent pending chunks as one request.
         Demonstrates COORDINATION between threads competing for work.
 
-        Returns: (chunk_id, start_byte, end_byte) or None if all chunks taken
-        """
-        with self.lock:  # CRITICAL SECTION - prevents race conditions
-            for chunk_id, (start, end) in enumerate(self.chunks):
-                if (chunk_id not in self.completed_chunks and
-                        chunk_id not in self.failed_chunks):
-                    # Mark as in-progress by adding to failed (temporarily)
-                    # This prevents another thread from taking the same chunk
-                    self.failed_chunks.add(chunk_id)
-                    return chunk_id, start, end
+        The run grows up to max_bytes, but never beyond an equal share of the
+        remaining work so other workers are not starved near the end.
 
-            return None
+        Returns: (chunk_ids, start_byte, end_byte) or None if no chunk is pending
+        """
+        remaining = sum(len(queue) for queue in self.local_queues)
+        max_bytes = min(max_bytes, remaining * self.chunk_size // self.num_connections)
+
+        # Local pop from the front of our own queue, else steal from the back
+        # of the busiest peer and walk the run backwards
+        own_queue = self.local_queues[worker_id % self.num_connections]
+        try:
+            first = own_queue.popleft()
+            take, put_back, step = own_queue.popleft, own_queue.appendleft, 1
+        except IndexError:
+            victim = max(self.local_queues, key=len)
+            try:
+                first = victim.pop()
+            except IndexError:
+                return None
+            take, put_back, step = victim.pop, victim.append, -1
+
+        chunk_ids = [first]
+        while True:
+            try:
+                next_id = take()
+            except IndexError:
+                break
+
+            low, high = sorted((first, next_id))
+            if (next_id != chunk_ids[-1] + step or
+                    self.chunks[high][1] - self.chunks[low][0] + 1 > max_bytes):
+                put_back(next_id)
+                break
+            chunk_ids.append(next_id)
+
+        chunk_ids.sort()
+        self.in_progress.update(chunk_ids)
+        return chunk_ids, self.chunks[chunk_ids[0]][0], self.chunks[chunk_ids[-1]][1]
 
     def mark_chunk_completed(self, chunk_id: int):
         """Mark a chunk as successfully downloaded"""
         with self.lock:  # SYNCHRONIZED access to shared state
-            if chunk_id in self.failed_chunks:
-                self.failed_chunks.remove(chunk_id)
-            self.completed_chunks.add(chunk_id)
+            self.in_progress.discard(chunk_id)
+            self.completed_count += 1
+            self.completion_cv.notify_all()
 
     def mark_chunk_failed(self, chunk_id: int):
-        """Mark a chunk as failed - allows retry logic"""
+        """Mark a chunk as failed - requeues it until retries run out"""
         with self.lock:
+            self.in_progress.discard(chunk_id)
             self.retry_count[chunk_id] = self.retry_count.get(chunk_id, 0) + 1
 
             if self.retry_count[chunk_id] <= self.max_retries:
-                # Remove from failed to allow retry
-                self.failed_chunks.remove(chunk_id)
+                # Put back on its home queue for another attempt, inverting
+                # the partition in __init__
+                owner = ((chunk_id + 1) * self.num_connections - 1) // len(self.chunks)
+                self.local_queues[owner].append(chunk_id)
             else:
                 # Permanent failure
+                self.failed_chunks.add(chunk_id)
+                self.failed_count += 1
                 logging.error(f"Chunk {chunk_id} failed after {self.max_retries} retries")
 
+            self.completion_cv.notify_all()
+
     def all_chunks_completed(self) -> bool:
         """Check if all chunks are downloaded"""
-        return len(self.completed_chunks) == len(self.chunks)
+        return self.completed_count == len(self.chunks)
 
     def get_progress(self) -> float:
-        """Get download progress percentage"""
-        with self.lock:
-            return (len(self.completed_chunks) / len(self.chunks)) * 100
\ No newline at end of file
+        """Get download progress percentage - a lock-free read of the counter"""
+        return (self.completed_count / len(self.chunks)) * 100
\ No newline at end of file
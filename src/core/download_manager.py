@@ -1,16 +1,16 @@
 import threading
-import os
 import time
-from typing import Optional, Callable
+from typing import List, Optional, Callable
 import logging
+from concurrent.futures import Future, ThreadPoolExecutor
 
-from core.thread_pool import ThreadPool
 from core.chunk_manager import ChunkManager
 from core.progress_tracker import ProgressTracker
 from network.http_client import HTTPClient
+from network.http2_client import HTTP2Client
 from network.range_request import RangeRequest
-from utils.file_ops import FileMerger, FileValidator
-from utils.validators import URLValidator, ConfigValidator
+from utils.file_ops import FileValidator, OutputFile
+from utils.validators import URLValidator, validate_connections_count, validate_chunk_size
 from utils.config import ConfigManager
 
 
@@ -24,16 +24,17 @@ class DownloadManager:
                  output_path: str,
                  num_connections: int = 4,
                  chunk_size: int = 1024 * 1024,
-                 config_file: str = "config.json"):
+                 config_file: str = "config.json",
+                 http2: bool = False):
 
         # Input validation
         if not URLValidator().is_valid_url(url):
             raise ValueError(f"Invalid URL: {url}")
 
-        if not ConfigValidator.validate_connections_count(num_connections):
+        if not validate_connections_count(num_connections):
             raise ValueError(f"Invalid number of connections: {num_connections}")
 
-        if not ConfigValidator.validate_chunk_size(chunk_size):
+        if not validate_chunk_size(chunk_size):
             raise ValueError(f"Invalid chunk size: {chunk_size}")
 
         # Ensure output directory exists
@@ -41,34 +42,46 @@ class DownloadManager:
 
         self.url = url
         self.output_path = output_path
+        self.output = OutputFile(output_path)
         self.num_connections = num_connections
         self.chunk_size = chunk_size
 
         # Initialize all components
         self.config = ConfigManager(config_file)
-        self.http_client = HTTPClient(timeout=self.config.get('timeout', 30))
+        client_class = HTTP2Client if http2 or self.config.get('http2', False) else HTTPClient
+        self.http_client = client_class(
+            timeout=self.config.get('timeout', 30),
+            buffer_size=self.config.get('buffer_size', 1024 * 1024),
+            pool_size=num_connections,
+            receive_buffer_size=self.config.get('receive_buffer_size')
+        )
         self.range_request = RangeRequest(self.http_client.session, self.config.get('timeout', 30))
-        self.thread_pool: Optional[ThreadPool] = None
+        self.thread_pool: Optional[ThreadPoolExecutor] = None
+        self.worker_futures: List[Future] = []
         self.chunk_manager: Optional[ChunkManager] = None
         self.progress_tracker = ProgressTracker()
-        self.file_merger = FileMerger(buffer_size=self.config.get('buffer_size', 8192 * 8))
         self.file_validator = FileValidator()
 
         # State management
-        self.is_downloading = False
+        self.done = threading.Event()  # Set once the download finished, failed or was stopped
         self.download_thread: Optional[threading.Thread] = None
         self.shutdown_event = threading.Event()
         self.last_progress_time = time.time()
+        self.last_logged_progress = -1
         self.stalled_threshold = 30
 
+        # Adaptive request sizing: aim for requests taking a couple of seconds
+        self.target_request_seconds = 2
+        self.max_request_size = 16 * 1024 * 1024
+
         self.logger = logging.getLogger(__name__)
 
     def start_download(self):
         """Start the parallel download process"""
-        if self.is_downloading:
+        if self.download_thread and not self.done.is_set():
             raise RuntimeError("Download already in progress")
 
-        self.is_downloading = True
+        self.done.clear()
         self.shutdown_event.clear()
 
         # Run in separate thread to avoid blocking
@@ -86,163 +99,212 @@ class DownloadManager:
                 self._download_single_connection()
                 return
 
-            # Step 2: Initialize chunk management
+            # Step 2: Pre-allocate the output so every chunk is written in place
+            self.output.open(file_size)
+
+            # Step 3: Initialize chunk management
             self.chunk_manager = ChunkManager(
                 total_size=file_size,
                 chunk_size=self.chunk_size,
                 num_connections=self.num_connections
             )
+            self.progress_tracker.reset(len(self.chunk_manager.chunks))
 
-            # Step 3: Create thread pool for parallel downloads
-            self.thread_pool = ThreadPool(
-                num_workers=self.num_connections,
-                name="DownloadWorker"
+            # Step 4: Create thread pool for parallel downloads
+            self.thread_pool = ThreadPoolExecutor(
+                max_workers=self.num_connections,
+                thread_name_prefix="DownloadWorker"
             )
 
             logging.info(f"Starting parallel download with {self.num_connections} connections")
             logging.info(f"File size: {file_size} bytes")
             logging.info(f"Chunk size: {self.chunk_size} bytes")
 
-            # Step 4: Start progress monitoring (separate thread)
-            progress_thread = threading.Thread(
-                target=self._progress_monitor,
-                daemon=True
-            )
-            progress_thread.start()
-
             # Step 5: PRODUCER-CONSUMER PATTERN IMPLEMENTATION
-            # Submit initial chunk download tasks
+            # Start one worker per connection, each keeps claiming chunks
             self._submit_chunk_tasks()
 
             # Step 6: Monitor and manage download process
+            # Workers signal completion_cv, so we only wake up when the
+            # download finished or nothing has happened for stalled_threshold
+            completion_cv = self.chunk_manager.completion_cv
             while not self.shutdown_event.is_set():
                 if self.chunk_manager.all_chunks_completed():
                     logging.info("All chunks downloaded successfully!")
                     break
 
+                if self.chunk_manager.failed_count:
+                    logging.error("Some chunks failed permanently, aborting download")
+                    self.shutdown_event.set()
+                    break
+
+                with completion_cv:
+                    woken = completion_cv.wait_for(
+                        self._needs_attention,
+                        timeout=self.stalled_threshold
+                    )
+
                 # Check for stalled download (deadlock detection)
-                if self._is_download_stalled():
+                if not woken and self._is_download_stalled():
                     logging.warning("Download appears stalled. Checking for issues...")
                     self._handle_stalled_download()
 
-                # Submit more tasks if needed (for retries)
-                self._submit_chunk_tasks()
-
-                time.sleep(0.5)
-
-            # Step 7: Merge chunks into final file
-            if not self.shutdown_event.is_set():
-                self._merge_chunks()
+            # Step 7: Move the completed file into place
+            if not self.shutdown_event.is_set() and self.chunk_manager.all_chunks_completed():
+                self.output.finalize()
                 logging.info(f"Download completed: {self.output_path}")
 
         except Exception as e:
             logging.error(f"Download process failed: {e}")
         finally:
-            self._cleanup()
+            if self.thread_pool:
+                # Let in-flight chunks finish before their fd is closed
+                self.thread_pool.shutdown(wait=True)
+            self.output.close()
+            self.done.set()
 
     def _download_single_connection(self):
         """Fallback method for when range requests aren't supported"""
         try:
             logging.info("Server doesn't support parallel downloads, using single connection")
-            self.http_client.download_chunk(
+            self.output.open()
+            written = self.http_client.download_chunk(
                 url=self.url,
-                output_file=self.output_path,
+                fd=self.output.fd,
                 start_byte=0,
                 end_byte=None  # Download entire file
             )
-            logging.info("Single connection download completed")
+            if written is not None:
+                self.output.finalize()
+                logging.info("Single connection download completed")
+            else:
+                logging.error("Single connection download failed")
         except Exception as e:
             logging.error(f"Single connection download failed: {e}")
         finally:
-            self._cleanup()
+            self.output.close()
 
     def _submit_chunk_tasks(self):
-        """Submit chunk download tasks to thread pool - PRODUCER"""
-        if not self.thread_pool or not self.chunk_manager:
+        """
+        Submit all work once up front - PRODUCER.
+        One worker per connection drains the chunk queues; failed chunks are
+        requeued by the worker that failed them, so nothing is resubmitted later.
+        """
+        if not self.thread_pool or not self.chunk_manager or self.shutdown_event.is_set():
             return
 
-        # Get available chunks and submit to thread pool
-        while True:
-            chunk_info = self.chunk_manager.get_next_chunk()
-            if not chunk_info:
-                break
+        self.worker_futures = [
+            self.thread_pool.submit(self._download_worker, worker_id)
+            for worker_id in range(self.num_connections)
+        ]
+        for future in self.worker_futures:
+            future.add_done_callback(self._on_worker_exit)
 
-            chunk_id, start, end = chunk_info
+    def _on_worker_exit(self, future: Future):
+        """
+        Wake the coordinator if a worker died, or if the last worker left
+        with chunks still outstanding - nothing else would ever notify it.
+        """
+        error = None if future.cancelled() else future.exception()
+        if error is not None:
+            logging.error(f"Download worker failed: {error}")
+        elif self.shutdown_event.is_set():
+            return  # Workers were told to stop, the coordinator already knows
+        elif not all(f.done() for f in self.worker_futures) or self.chunk_manager.all_chunks_completed():
+            return
+        else:
+            logging.error("All download workers exited with chunks outstanding")
 
-            # CONSUMER task submission
-            self.thread_pool.submit(
-                self._download_chunk,
-                chunk_id,
-                start,
-                end
-            )
+        self.shutdown_event.set()
+        with self.chunk_manager.completion_cv:
+            self.chunk_manager.completion_cv.notify_all()
 
-    def _download_chunk(self, chunk_id: int, start: int, end: int):
+    def _download_worker(self, worker_id: int):
         """
-        Enhanced chunk download with progress tracking and validation.
+        CONSUMER loop: claim the next range sized to the measured throughput
+        and download it, until no chunk is left. Failed chunks are requeued by
+        the ChunkManager, so the worker that failed picks them up again.
         """
-        temp_file = f"{self.output_path}.part{chunk_id}"
-        chunk_size = end - start + 1
+        while not self.shutdown_event.is_set():
+            chunk_range = self.chunk_manager.get_next_range(self._next_request_size(), worker_id)
+            if not chunk_range:
+                return
 
-        # Start tracking this chunk
-        self.progress_tracker.start_chunk_tracking(chunk_id)
+            self._download_chunk(*chunk_range)
+
+    def _next_request_size(self) -> int:
+        """Bytes per request so that one request takes about target_request_seconds"""
+        speed = self.progress_tracker.get_recent_speed()
+        if not speed:
+            return self.chunk_size
+
+        size = int(speed * self.target_request_seconds)
+        return max(self.chunk_size, min(size, self.max_request_size))
+
+    def _download_chunk(self, chunk_ids: List[int], start: int, end: int):
+        """
+        Enhanced chunk download with progress tracking and validation.
+        Downloads a run of adjacent chunks with a single range request.
+        """
+        first_id = chunk_ids[0]
+        range_size = end - start + 1
 
         try:
-            self.logger.debug(f"Downloading chunk {chunk_id}: bytes {start}-{end}")
+            # Track the whole request against its first chunk
+            self.progress_tracker.start_chunk_tracking(first_id)
+
+            self.logger.debug(f"Downloading chunks {first_id}-{chunk_ids[-1]}: bytes {start}-{end}")
 
-            # Download the chunk
-            success = self.http_client.download_chunk(
+            # Download the range straight into its region of the output file
+            written = self.http_client.download_chunk(
                 url=self.url,
-                output_file=temp_file,
+                fd=self.output.fd,
                 start_byte=start,
                 end_byte=end
             )
 
-            if success:
-                # Verify chunk was downloaded completely
-                if os.path.exists(temp_file):
-                    actual_size = os.path.getsize(temp_file)
-                    expected_size = chunk_size
-
-                    if actual_size == expected_size:
-                        self.chunk_manager.mark_chunk_completed(chunk_id)
-                        self.progress_tracker.update_progress(
-                            chunk_id, True, actual_size
-                        )
-                        self.logger.debug(f"Chunk {chunk_id} completed successfully")
-                    else:
-                        self.logger.warning(
-                            f"Chunk {chunk_id} size mismatch. "
-                            f"Expected: {expected_size}, Got: {actual_size}"
-                        )
-                        self.chunk_manager.mark_chunk_failed(chunk_id)
-                        self.progress_tracker.update_progress(chunk_id, False)
-                else:
-                    self.logger.error(f"Chunk file not created: {temp_file}")
-                    self.chunk_manager.mark_chunk_failed(chunk_id)
-                    self.progress_tracker.update_progress(chunk_id, False)
+            if written == range_size:
+                self.progress_tracker.update_progress(first_id, True, range_size)
+                for chunk_id in chunk_ids[1:]:
+                    self.progress_tracker.update_progress(chunk_id, True)
+                for chunk_id in chunk_ids:
+                    self.chunk_manager.mark_chunk_completed(chunk_id)
+                self.logger.debug(f"Chunks {first_id}-{chunk_ids[-1]} completed successfully")
+                self._report_progress()
+            elif written is not None:
+                self.logger.warning(
+                    f"Chunks {first_id}-{chunk_ids[-1]} size mismatch. "
+                    f"Expected: {range_size}, Got: {written}"
+                )
+                self._mark_failed(chunk_ids)
             else:
-                self.logger.error(f"HTTP download failed for chunk {chunk_id}")
-                self.chunk_manager.mark_chunk_failed(chunk_id)
-                self.progress_tracker.update_progress(chunk_id, False)
+                self.logger.error(f"HTTP download failed for chunks {first_id}-{chunk_ids[-1]}")
+                self._mark_failed(chunk_ids)
 
         except Exception as e:
-            self.logger.error(f"Unexpected error in chunk {chunk_id}: {e}")
+            self.logger.error(f"Unexpected error in chunks {first_id}-{chunk_ids[-1]}: {e}")
+            self._mark_failed(chunk_ids)
+
+    def _mark_failed(self, chunk_ids: List[int]):
+        """Report a failed request for every chunk it covered"""
+        for chunk_id in chunk_ids:
             self.chunk_manager.mark_chunk_failed(chunk_id)
             self.progress_tracker.update_progress(chunk_id, False)
 
-    def _progress_monitor(self):
-        """Monitor download progress and detect issues"""
-        while self.is_downloading and not self.shutdown_event.is_set():
-            if self.chunk_manager:
-                progress = self.chunk_manager.get_progress()
-                logging.info(f"Download progress: {progress:.1f}%")
+    def _needs_attention(self) -> bool:
+        """Wake-up condition for the coordinator, evaluated under completion_cv"""
+        return (self.shutdown_event.is_set() or
+                self.chunk_manager.failed_count > 0 or
+                self.chunk_manager.all_chunks_completed())
 
-                # Update progress time for stall detection
-                if progress > 0:
-                    self.last_progress_time = time.time()
+    def _report_progress(self):
+        """Log progress after a chunk completes - replaces the polling monitor"""
+        self.last_progress_time = time.time()
 
-            time.sleep(2)
+        progress = int(self.chunk_manager.get_progress())
+        if progress != self.last_logged_progress:
+            self.last_logged_progress = progress
+            logging.info(f"Download progress: {progress}%")
 
     def _is_download_stalled(self) -> bool:
         """Detect if download is stalled (potential deadlock)"""
@@ -255,35 +317,18 @@ class DownloadManager:
             logging.info("Attempting to recover from stalled state...")
             self.last_progress_time = time.time()  # Reset timer
 
-    def _merge_chunks(self):
-        """Merge all downloaded chunks into final file"""
-        if not self.chunk_manager:
-            return
-
-        chunk_files = [
-            f"{self.output_path}.part{chunk_id}"
-            for chunk_id in range(len(self.chunk_manager.chunks))
-        ]
-
-        self.file_merger.merge_files(chunk_files, self.output_path)
-
-        # Cleanup temporary chunk files
-        for chunk_file in chunk_files:
-            try:
-                os.remove(chunk_file)
-            except OSError:
-                pass
-
-    def _cleanup(self):
-        """Cleanup resources"""
-        self.is_downloading = False
-        if self.thread_pool:
-            self.thread_pool.shutdown(wait=False)
-
     def stop_download(self):
-        """Stop the download process"""
+        """Stop the download process and wait for in-flight chunks to drain"""
         self.shutdown_event.set()
-        self._cleanup()
+        if self.chunk_manager:
+            # Wake the coordinator so it notices the shutdown immediately
+            with self.chunk_manager.completion_cv:
+                self.chunk_manager.completion_cv.notify_all()
+
+        # The download thread drains the pool and releases the output file
+        if self.download_thread and self.download_thread is not threading.current_thread():
+            self.download_thread.join()
+        self.done.set()
 
     def get_download_info(self) -> dict:
         """Get comprehensive download information"""
@@ -293,8 +338,8 @@ class DownloadManager:
         return {
             'progress_percentage': self.progress_tracker.get_overall_progress(),
             'average_speed_bps': self.progress_tracker.get_average_speed(),
-            'completed_chunks': len(self.progress_tracker.completed_chunks),
+            'completed_chunks': self.progress_tracker.get_completed_chunks_count(),
             'failed_chunks': self.progress_tracker.get_failed_chunks_count(),
             'total_chunks': len(self.chunk_manager.chunks),
-            'is_downloading': self.is_downloading
+            'is_downloading': not self.done.is_set()
         }
\ No newline at end of file
@@ -1,82 +1,91 @@
-import threading
 import time
-from typing import Dict, Set
+from array import array
+from collections import deque
 import logging
 
+PENDING = 0
+COMPLETED = 1
+FAILED = 2
+
 
 class ProgressTracker:
     """
-    Tracks download progress across multiple threads with thread-safe operations.
-    Demonstrates shared state management in concurrent environments.
+    Tracks download progress across multiple threads without locking.
+    Every chunk owns one slot in fixed-size arrays, and only the worker
+    downloading a chunk writes to its slot, so plain stores are enough.
     """
 
-    def __init__(self):
-        self.completed_chunks: Set[int] = set()
-        self.failed_chunks: Set[int] = set()
-        self.chunk_speeds: Dict[int, float] = {}
-        self.chunk_start_times: Dict[int, float] = {}
-        self.lock = threading.RLock()  # Reentrant lock for nested calls
-        self.total_bytes = 0
-        self.downloaded_bytes = 0
+    def __init__(self, num_chunks: int = 0):
+        self.reset(num_chunks)
 
     def update_progress(self, chunk_id: int, success: bool, bytes_downloaded: int = 0):
         """
-        Update progress for a chunk. Thread-safe method demonstrating
-        coordinated state updates.
+        Update progress for a chunk. Lock-free: the caller owns chunk_id.
         """
-        with self.lock:  # SYNCHRONIZATION: Protecting shared state
-            if success:
-                self.completed_chunks.add(chunk_id)
-                if chunk_id in self.failed_chunks:
-                    self.failed_chunks.remove(chunk_id)
-
-                # Calculate download speed for this chunk
-                if chunk_id in self.chunk_start_times:
-                    download_time = time.time() - self.chunk_start_times[chunk_id]
-                    if download_time > 0:
-                        speed = bytes_downloaded / download_time
-                        self.chunk_speeds[chunk_id] = speed
-
-                    # Clean up
-                    del self.chunk_start_times[chunk_id]
-
-                self.downloaded_bytes += bytes_downloaded
-            else:
-                self.failed_chunks.add(chunk_id)
-                if chunk_id in self.completed_chunks:
-                    self.completed_chunks.remove(chunk_id)
+        if success:
+            self.state[chunk_id] = COMPLETED
+            self.chunk_bytes[chunk_id] = bytes_downloaded
+
+            # Calculate download speed for this chunk, in integer bytes/second
+            start_ns = self.start_times[chunk_id]
+            if start_ns:
+                elapsed_ns = time.monotonic_ns() - start_ns
+                if elapsed_ns > 0:
+                    speed = bytes_downloaded * 1_000_000_000 // elapsed_ns
+                    self.speeds[chunk_id] = speed
+                    self.recent_speeds.append(speed)
+
+                # Clean up
+                self.start_times[chunk_id] = 0
+        else:
+            self.state[chunk_id] = FAILED
 
     def start_chunk_tracking(self, chunk_id: int):
         """Start tracking time for a chunk download"""
-        with self.lock:
-            self.chunk_start_times[chunk_id] = time.time()
+        self.start_times[chunk_id] = time.monotonic_ns()
+
+    # Aggregates below are single C-level passes over the arrays, which the GIL
+    # keeps consistent while workers store into their own slots
+
+    @property
+    def downloaded_bytes(self) -> int:
+        """Total bytes of all completed chunks"""
+        return sum(self.chunk_bytes)
 
     def get_overall_progress(self) -> float:
         """Get overall progress percentage"""
-        with self.lock:
-            total_chunks = len(self.completed_chunks) + len(self.failed_chunks)
-            if total_chunks == 0:
-                return 0.0
-            return (len(self.completed_chunks) / total_chunks) * 100
+        completed = self.state.count(COMPLETED)
+        total_chunks = completed + self.state.count(FAILED)
+        if total_chunks == 0:
+            return 0.0
+        return (completed / total_chunks) * 100
 
     def get_average_speed(self) -> float:
         """Calculate average download speed across all chunks"""
-        with self.lock:
-            if not self.chunk_speeds:
-                return 0.0
-            return sum(self.chunk_speeds.values()) / len(self.chunk_speeds)
+        measured = len(self.speeds) - self.speeds.count(0)
+        if not measured:
+            return 0.0
+        return sum(self.speeds) / measured
+
+    def get_recent_speed(self) -> float:
+        """Per-connection speed over the last few requests, in bytes per second"""
+        recent = list(self.recent_speeds)
+        if not recent:
+            return 0.0
+        return sum(recent) / len(recent)
+
+    def get_completed_chunks_count(self) -> int:
+        """Get count of completed chunks"""
+        return self.state.count(COMPLETED)
 
     def get_failed_chunks_count(self) -> int:
         """Get count of failed chunks"""
-        with self.lock:
-            return len(self.failed_chunks)
-
-    def reset(self):
-        """Reset all progress tracking"""
-        with self.lock:
-            self.completed_chunks.clear()
-            self.failed_chunks.clear()
-            self.chunk_speeds.clear()
-            self.chunk_start_times.clear()
-            self.total_bytes = 0
-            self.downloaded_bytes = 0
\ No newline at end of file
+        return self.state.count(FAILED)
+
+    def reset(self, num_chunks: int = 0):
+        """Reset all progress tracking, sized for num_chunks chunks"""
+        self.state = bytearray(num_chunks)
+        self.speeds = array('q', [0]) * num_chunks  # bytes/second
+        self.start_times = array('q', [0]) * num_chunks  # monotonic_ns, 0 = not started
+        self.chunk_bytes = array('q', [0]) * num_chunks
+        self.recent_speeds = deque(maxlen=8)  # Latest per-request speeds
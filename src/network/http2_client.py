@@ -0,0 +1,77 @@
+import logging
+from typing import Optional
+
+try:
+    import httpx
+except ImportError:  # Optional dependency, only needed for HTTP/2
+    httpx = None
+
+from network.http_client import HTTPClient
+from network.range_request import (DEFAULT_HEADERS, range_headers, range_length, file_size_from_head,
+                                   check_range_response)
+from utils.file_ops import pwrite
+
+
+class HTTP2Client(HTTPClient):
+    """
+    HTTPClient variant that multiplexes all range requests as HTTP/2 streams
+    over a single connection. Falls back to HTTP/1.1 keep-alive when the
+    server doesn't negotiate h2.
+    """
+
+    def __init__(self, timeout: int = 30, buffer_size: int = 1024 * 1024, pool_size: int = 10,
+                 receive_buffer_size: Optional[int] = None):
+        if httpx is None:
+            raise RuntimeError("HTTP/2 support requires httpx: pip install httpx[http2]")
+
+        super().__init__(timeout=timeout, buffer_size=buffer_size, pool_size=pool_size,
+                         receive_buffer_size=receive_buffer_size)
+
+        self.client = httpx.Client(
+            http2=True,
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=timeout,
+            follow_redirects=True,
+            headers=DEFAULT_HEADERS
+        )
+
+    def get_file_size(self, url: str) -> Optional[int]:
+        """Check if server supports range requests and get file size"""
+        try:
+            response = self.client.head(url)
+            response.raise_for_status()
+
+            logging.info(f"Negotiated {response.http_version}")
+            return file_size_from_head(response.headers)
+
+        except Exception as e:
+            logging.error(f"Error getting file info: {e}")
+            return None
+
+    def download_chunk(self, url: str, fd: int, start_byte: int, end_byte: int = None) -> Optional[int]:
+        """
+        Download a specific byte range straight into fd at offset start_byte.
+        Returns the number of bytes written, or None if the request failed.
+        """
+        try:
+            with self.client.stream("GET", url, headers=range_headers(start_byte, end_byte)) as response:
+                response.raise_for_status()
+                if not check_range_response(response.status_code, response.headers, start_byte, end_byte):
+                    return None
+
+                # Never write past the range: surplus bytes would land in other chunks
+                offset = start_byte
+                remaining = range_length(start_byte, end_byte)
+                for buffer in response.iter_raw(chunk_size=self.buffer_size):
+                    buffer = buffer[:remaining]
+                    pwrite(fd, buffer, offset)
+                    offset += len(buffer)
+                    remaining -= len(buffer)
+                    if not remaining:
+                        break
+
+            return offset - start_byte
+
+        except Exception as e:
+            logging.error(f"Download failed: {e}")
+            return None
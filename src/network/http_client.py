@@ -1,31 +1,62 @@
 import requests
 import logging
+import socket
+import threading
 from typing import Optional
+from urllib3.connection import HTTPConnection
+
+from network.range_request import (DEFAULT_HEADERS, range_headers, range_length, file_size_from_head,
+                                   check_range_response)
+from utils.file_ops import pwrite
+
+
+class LargeBufferAdapter(requests.adapters.HTTPAdapter):
+    """
+    HTTPAdapter whose sockets can be given a fixed kernel receive buffer.
+    Off by default: on Linux an explicit SO_RCVBUF disables receive-window
+    autotuning and is capped by net.core.rmem_max, so it only helps where
+    those limits have been raised for it.
+    """
+
+    def __init__(self, receive_buffer_size: Optional[int] = None, **kwargs):
+        # Must be set before the base class builds the pool manager
+        self.socket_options = list(HTTPConnection.default_socket_options)
+        if receive_buffer_size:
+            self.socket_options.append((socket.SOL_SOCKET, socket.SO_RCVBUF, receive_buffer_size))
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['socket_options'] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs['socket_options'] = self.socket_options
+        return super().proxy_manager_for(proxy, **proxy_kwargs)
 
 
 class HTTPClient:
     """HTTP client supporting range requests for parallel downloads"""
 
-    def __init__(self, timeout: int = 30):
+    def __init__(self, timeout: int = 30, buffer_size: int = 1024 * 1024, pool_size: int = 10,
+                 receive_buffer_size: Optional[int] = None):
         self.timeout = timeout
+        self.buffer_size = buffer_size
+        self._local = threading.local()  # Per-thread reusable read buffer
         self.session = requests.Session()
 
-        # Optimize connection pooling
-        adapter = requests.adapters.HTTPAdapter(
-            pool_connections=10,  # Increased connection pool
-            pool_maxsize=10,  # Allow more simultaneous connections
+        # Size the pool to the number of workers so every connection is reused
+        adapter = LargeBufferAdapter(
+            receive_buffer_size=receive_buffer_size,  # None: leave it to kernel autotuning
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
             max_retries=2,  # Retry failed requests
-            pool_block=False  # Don't block when pool is full
+            pool_block=True  # Never open throwaway connections beyond the pool
         )
         self.session.mount('http://', adapter)
         self.session.mount('https://', adapter)
 
         # Set optimized headers
-        self.session.headers.update({
-            'User-Agent': 'ParallelDownloader/1.0',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive'
-        })
+        self.session.headers.update({**DEFAULT_HEADERS, 'Connection': 'keep-alive'})
 
     def get_file_size(self, url: str) -> Optional[int]:
         """Check if server supports range requests and get file size"""
@@ -34,36 +65,55 @@ class HTTPClient:
             response.raise_for_status()
 
             # Check if server supports range requests
-            accept_ranges = response.headers.get('Accept-Ranges', 'none').lower()
-            content_length = response.headers.get('Content-Length')
-
-            if accept_ranges != 'bytes' or not content_length:
-                logging.warning("Server doesn't support byte range requests")
-                return None
-
-            return int(content_length)
+            return file_size_from_head(response.headers)
 
         except Exception as e:
             logging.error(f"Error getting file info: {e}")
             return None
 
-    def download_chunk(self, url: str, output_file: str, start_byte: int, end_byte: int = None) -> bool:
-        """Download a specific byte range, returns True if successful"""
-        headers = {}
-        if end_byte is not None:
-            headers = {'Range': f'bytes={start_byte}-{end_byte}'}
+    def download_chunk(self, url: str, fd: int, start_byte: int, end_byte: int = None) -> Optional[int]:
+        """
+        Download a specific byte range straight into fd at offset start_byte.
+        Returns the number of bytes written, or None if the request failed.
+        """
+        headers = range_headers(start_byte, end_byte)
 
         try:
-            response = self.session.get(url, headers=headers, timeout=self.timeout, stream=True)
-            response.raise_for_status()
+            # Closing the response hands its connection back to the bounded pool on every path
+            with self.session.get(url, headers=headers, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                if not check_range_response(response.status_code, response.headers, start_byte, end_byte):
+                    return None
 
-            with open(output_file, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+                # Read into one reusable buffer instead of allocating per block,
+                # and only write once it is full so every pwrite is a large one.
+                # Never read past the range: surplus bytes would land in other chunks
+                response.raw.decode_content = True
+                view = self._get_buffer()
+                offset = start_byte
+                remaining = range_length(start_byte, end_byte)
+                filled = 0
+                while True:
+                    size = response.raw.readinto(view[filled:min(len(view), filled + remaining)])
+                    filled += size
+                    remaining -= size
+                    if filled == len(view) or (not size and filled):
+                        pwrite(fd, view[:filled], offset)
+                        offset += filled
+                        filled = 0
+                    if not size:
+                        break
 
-            return True
+            return offset - start_byte
 
         except Exception as e:
             logging.error(f"Download failed: {e}")
-            return False
\ No newline at end of file
+            return None
+
+    def _get_buffer(self) -> memoryview:
+        """Return this thread's read buffer, allocating it on first use"""
+        view = getattr(self._local, 'view', None)
+        if view is None:
+            view = memoryview(bytearray(self.buffer_size))
+            self._local.view = view
+        return view
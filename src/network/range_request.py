@@ -1,5 +1,90 @@
+import sys
 import requests
-from typing import Tuple, Optional
+import logging
+from typing import Mapping, Tuple, Optional
+
+# Headers sent by every client, whichever HTTP library backs it
+DEFAULT_HEADERS = {
+    'User-Agent': 'ParallelDownloader/1.0',
+    # Compressed bodies break byte ranges, always ask for the raw bytes
+    'Accept-Encoding': 'identity'
+}
+
+
+def range_headers(start_byte: int, end_byte: Optional[int]) -> dict:
+    """Request headers for bytes start_byte-end_byte, or the whole file if end_byte is None"""
+    if end_byte is None:
+        return {}
+    return {'Range': f'bytes={start_byte}-{end_byte}'}
+
+
+def range_length(start_byte: int, end_byte: Optional[int]) -> int:
+    """Most bytes to read for a request, unbounded (sys.maxsize) for the whole file"""
+    if end_byte is None:
+        return sys.maxsize
+    return end_byte - start_byte + 1
+
+
+def parse_content_range(content_range: Optional[str]) -> Optional[Tuple[int, int, int]]:
+    """
+    Parse a Content-Range header value.
+    Returns (start, end, total), total being -1 if the server didn't know it, or None if malformed.
+    """
+    try:
+        # Parse: "bytes 0-999/1000" -> (0, 999, 1000)
+        unit, _, range_info = content_range.partition(' ')
+        range_part, total_part = range_info.split('/')
+        start, end = map(int, range_part.split('-'))
+        total = -1 if total_part == '*' else int(total_part)
+    except (AttributeError, ValueError):
+        return None
+
+    if unit != 'bytes':
+        return None
+    return start, end, total
+
+
+def file_size_from_head(headers: Mapping[str, str]) -> Optional[int]:
+    """File size from the headers of a HEAD reply, or None if ranges aren't supported"""
+    accept_ranges = headers.get('Accept-Ranges', 'none').lower()
+    content_length = headers.get('Content-Length')
+
+    if accept_ranges != 'bytes' or not content_length:
+        logging.warning("Server doesn't support byte range requests")
+        return None
+
+    return int(content_length)
+
+
+def check_range_response(status_code: int, headers: Mapping[str, str],
+                         start_byte: int, end_byte: Optional[int]) -> bool:
+    """
+    Check that a reply to a range request carries exactly the requested range.
+    Every range is written in place into one shared file, so bytes from any
+    other range would overwrite regions that belong to other chunks.
+    """
+    if end_byte is None:
+        return True
+
+    # A 200 means the server ignored the range and sent the whole file. Its
+    # first bytes are still the requested ones when the range starts at 0,
+    # and the read loops stop at range_length
+    if status_code == 200 and start_byte == 0:
+        return True
+
+    if status_code != 206:
+        logging.error(f"Server ignored range request (status {status_code})")
+        return False
+
+    content_range = parse_content_range(headers.get('Content-Range'))
+    if content_range is None or content_range[:2] != (start_byte, end_byte):
+        logging.error(
+            f"Server sent range {headers.get('Content-Range')!r} "
+            f"for requested bytes {start_byte}-{end_byte}"
+        )
+        return False
+
+    return True
 
 
 class RangeRequest:
@@ -20,19 +105,19 @@ class RangeRequest:
         headers = {'Range': f'bytes={start_byte}-{end_byte}'}
 
         try:
-            response = self.session.get(
+            with self.session.get(
                 url,
                 headers=headers,
                 timeout=self.timeout,
                 stream=True
-            )
-            response.raise_for_status()
+            ) as response:
+                response.raise_for_status()
 
-            # Verify we got a partial content response
-            if response.status_code != 206:  # Partial Content
-                return False, b""
+                # Verify we got a partial content response
+                if response.status_code != 206:  # Partial Content
+                    return False, b""
 
-            return True, response.content
+                return True, response.content
 
         except requests.exceptions.RequestException as e:
             return False, b""
@@ -46,17 +131,7 @@ class RangeRequest:
 
         try:
             response = self.session.head(url, headers=headers, timeout=self.timeout)
-            content_range = response.headers.get('Content-Range')
-
-            if content_range:
-                # Parse: "bytes 0-999/1000" -> (0, 999, 1000)
-                range_info = content_range.split(' ')[1]
-                range_part, total_part = range_info.split('/')
-                start, end = map(int, range_part.split('-'))
-                total = int(total_part)
-                return start, end, total
-
-        except (requests.exceptions.RequestException, ValueError, IndexError):
-            pass
+            return parse_content_range(response.headers.get('Content-Range'))
 
-        return None
\ No newline at end of file
+        except requests.exceptions.RequestException:
+            return None
\ No newline at end of file
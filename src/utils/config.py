@@ -1,62 +1,124 @@
 import json
 import os
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 import logging
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, fall back to the stdlib json module
+    orjson = None
+
+_LOG = logging.getLogger(__name__)
+
+_DEFAULT = MappingProxyType({
+    "default_connections": 4,
+    "chunk_size": 1024 * 1024,  # 1MB
+    "timeout": 30,
+    "max_retries": 3,
+    "user_agent": "ParallelDownloader/1.0",
+    "buffer_size": 1024 * 1024,  # 1MB
+    "http2": False,
+    "receive_buffer_size": None  # Bytes of SO_RCVBUF, None keeps kernel autotuning
+})
+
+
+def _signature(stat: os.stat_result) -> Tuple[int, int, int]:
+    """
+    What identifies a version of the config file. The mtime alone misses edits
+    made within one timestamp tick on coarse filesystems (FAT, HFS+, some NFS)
+    """
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
 
 
 class ConfigManager:
     """
     Manages application configuration with file persistence.
     Demonstrates configuration management pattern.
+
+    Changes are kept in memory until flush() is called, or until the
+    `with ConfigManager(...) as config:` block exits.
     """
 
+    # Parsed config files shared by all instances: abspath -> (file signature, parsed dict)
+    _cache: Dict[str, Tuple[Tuple[int, int, int], Dict[str, Any]]] = {}
+
     def __init__(self, config_file: str = "config.json"):
         self.config_file = config_file
         self.config: Dict[str, Any] = {}
-        self.default_config = {
-            "default_connections": 4,
-            "chunk_size": 1024 * 1024,  # 1MB
-            "timeout": 30,
-            "max_retries": 3,
-            "user_agent": "ParallelDownloader/1.0",
-            "buffer_size": 8192 * 8  # 64KB
-        }
-        self.logger = logging.getLogger(__name__)
+        self._dirty = False
+        self.default_config = _DEFAULT  # Read-only, copied whenever config is built from it
         self._load_config()
 
     def _load_config(self):
-        """Load configuration from file or create default"""
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r') as f:
-                    loaded_config = json.load(f)
-                self.config = {**self.default_config, **loaded_config}
-                self.logger.info(f"Loaded configuration from {self.config_file}")
-            except (json.JSONDecodeError, IOError) as e:
-                self.logger.warning(f"Failed to load config, using defaults: {e}")
-                self.config = self.default_config.copy()
-        else:
+        """Load configuration from file (or the parse cache) or create default"""
+        cache_key = os.path.abspath(self.config_file)
+        try:
+            signature = _signature(os.stat(self.config_file))
+        except OSError:
             self.config = self.default_config.copy()
             self._save_config()
+            return
+
+        cached = self._cache.get(cache_key)
+        if cached and cached[0] == signature:
+            self.config = {**self.default_config, **cached[1]}
+            return
+
+        try:
+            if orjson:
+                with open(self.config_file, 'rb') as f:
+                    loaded_config = orjson.loads(f.read())
+            else:
+                with open(self.config_file, 'r', encoding='utf-8') as f:
+                    loaded_config = json.load(f)
+            self._cache[cache_key] = (signature, loaded_config)
+            self.config = {**self.default_config, **loaded_config}
+            _LOG.info(f"Loaded configuration from {self.config_file}")
+        except (json.JSONDecodeError, IOError) as e:
+            _LOG.warning(f"Failed to load config, using defaults: {e}")
+            self.config = self.default_config.copy()
 
     def _save_config(self):
         """Save current configuration to file"""
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            if orjson:
+                with open(self.config_file, 'wb') as f:
+                    f.write(orjson.dumps(self.config, option=orjson.OPT_INDENT_2))
+            else:
+                # Raw UTF-8 like orjson, so either path reads what the other wrote
+                with open(self.config_file, 'w', encoding='utf-8') as f:
+                    json.dump(self.config, f, indent=2, ensure_ascii=False)
+            self._dirty = False
+
+            # What we just wrote is what the next instance would parse
+            self._cache[os.path.abspath(self.config_file)] = (
+                _signature(os.stat(self.config_file)), dict(self.config)
+            )
         except IOError as e:
-            self.logger.error(f"Failed to save config: {e}")
+            _LOG.error(f"Failed to save config: {e}")
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value"""
         return self.config.get(key, default)
 
     def set(self, key: str, value: Any):
-        """Set configuration value and save"""
+        """Set configuration value, persisted on the next flush()"""
         self.config[key] = value
-        self._save_config()
+        self._dirty = True
 
     def update(self, new_config: Dict[str, Any]):
-        """Update multiple configuration values"""
+        """Update multiple configuration values, persisted on the next flush()"""
         self.config.update(new_config)
-        self._save_config()
\ No newline at end of file
+        self._dirty = True
+
+    def flush(self):
+        """Write pending changes to the config file, if there are any"""
+        if self._dirty:
+            self._save_config()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
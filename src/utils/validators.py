@@ -1,69 +1,89 @@
-import re
+import os
+import string
+from functools import lru_cache
 from urllib.parse import urlparse
 import logging
 
+from utils.file_ops import FileValidator
+
+# Longest URL accepted, well above what servers and proxies allow in practice
+MAX_URL_LENGTH = 8192
+
+# Characters allowed in a domain label
+_LABEL_CHARS = frozenset(string.ascii_letters + string.digits + '-')
+
 
 class URLValidator:
     """Validates URLs for the downloader"""
 
     def __init__(self):
         self.supported_schemes = {'http', 'https'}
+        self._prefixes = tuple(f'{scheme}://' for scheme in self.supported_schemes)
+        self._prefix_length = max(len(prefix) for prefix in self._prefixes)
         self.logger = logging.getLogger(__name__)
 
     def is_valid_url(self, url: str) -> bool:
         """Validate if URL is properly formatted and supported"""
-        if not url or not isinstance(url, str):
+        if not url or not isinstance(url, str) or len(url) > MAX_URL_LENGTH:
+            return False
+
+        # Reject unsupported schemes before paying for urlparse
+        if not url[:self._prefix_length].lower().startswith(self._prefixes):
+            self.logger.warning(f"Unsupported URL scheme: {url.partition(':')[0]}")
             return False
 
         try:
             result = urlparse(url)
-
-            # Check scheme
-            if result.scheme not in self.supported_schemes:
-                self.logger.warning(f"Unsupported URL scheme: {result.scheme}")
-                return False
-
-            # Check netloc (domain)
-            if not result.netloc:
-                self.logger.warning("URL missing domain")
-                return False
-
-            # Basic domain validation
-            if not self._is_valid_domain(result.netloc):
-                return False
-
-            return True
-
-        except Exception as e:
+        except ValueError as e:  # e.g. malformed IPv6 host
             self.logger.error(f"URL validation error: {e}")
             return False
 
+        # Check netloc (domain)
+        if not result.netloc:
+            self.logger.warning("URL missing domain")
+            return False
+
+        # Basic domain validation
+        return self._is_valid_domain(result.netloc)
+
     def _is_valid_domain(self, domain: str) -> bool:
         """Validate domain name format"""
         # Remove port if present
         domain = domain.split(':')[0]
 
-        # Basic domain pattern validation
-        domain_pattern = r'^[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?(\.[a-zA-Z0-9]([a-zA-Z0-9-]{0,61}[a-zA-Z0-9])?)*$'
-        return bool(re.match(domain_pattern, domain))
+        if not domain or len(domain) > 253:
+            return False
+
+        # Every dot-separated label: 1-63 allowed characters, no edge hyphens
+        for label in domain.split('.'):
+            if not 1 <= len(label) <= 63 or label[0] == '-' or label[-1] == '-':
+                return False
+            if not _LABEL_CHARS.issuperset(label):
+                return False
+
+        return True
+
+
+def validate_connections_count(connections: int) -> bool:
+    """Validate number of parallel connections"""
+    return 1 <= connections <= 16  # Reasonable limits
+
+
+def validate_chunk_size(chunk_size: int) -> bool:
+    """Validate chunk size"""
+    return 1024 <= chunk_size <= 1024 * 1024 * 100  # 100KB to 100MB
+
+
+@lru_cache(maxsize=256)
+def validate_output_path(path: str) -> bool:
+    """Validate output file path"""
+    filename = os.path.basename(path)
+    return FileValidator.is_valid_filename(filename)
 
 
 class ConfigValidator:
-    """Validates configuration parameters"""
-
-    @staticmethod
-    def validate_connections_count(connections: int) -> bool:
-        """Validate number of parallel connections"""
-        return 1 <= connections <= 16  # Reasonable limits
-
-    @staticmethod
-    def validate_chunk_size(chunk_size: int) -> bool:
-        """Validate chunk size"""
-        return 1024 <= chunk_size <= 1024 * 1024 * 100  # 100KB to 100MB
-
-    @staticmethod
-    def validate_output_path(path: str) -> bool:
-        """Validate output file path"""
-        from .file_ops import FileValidator
-        filename = os.path.basename(path)
-        return FileValidator.is_valid_filename(filename)
\ No newline at end of file
+    """Validates configuration parameters, kept for existing callers of the functions above"""
+
+    validate_connections_count = staticmethod(validate_connections_count)
+    validate_chunk_size = staticmethod(validate_chunk_size)
+    validate_output_path = staticmethod(validate_output_path)
@@ -0,0 +1,182 @@
+import unittest
+import asyncio
+import os
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+# Add src to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from core import async_downloader
+from core.async_downloader import AsyncDownloader
+from core.chunk_manager import ChunkManager
+from utils.file_ops import pwritev
+
+SOURCE = os.urandom(1024 * 1024 + 321)
+CHUNK_SIZE = 64 * 1024
+
+
+class RangeHandler(BaseHTTPRequestHandler):
+    """Serves SOURCE with single byte ranges, or a fixed error status"""
+
+    protocol_version = 'HTTP/1.1'
+    error_status = None  # Answer every request with this status
+    failing_start = None  # Answer ranges starting here with a 500
+    on_failure = None  # Called before each such 500
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_empty(self, status: int):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_HEAD(self):
+        if self.error_status:
+            return self._send_empty(self.error_status)
+        self.send_response(200)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Length', str(len(SOURCE)))
+        self.end_headers()
+
+    def do_GET(self):
+        if self.error_status:
+            return self._send_empty(self.error_status)
+
+        match = re.fullmatch(r'bytes=(\d+)-(\d+)', self.headers.get('Range', ''))
+        if not match:
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(SOURCE)))
+            self.end_headers()
+            self.wfile.write(SOURCE)
+            return
+
+        start, end = int(match.group(1)), int(match.group(2))
+        if start == self.failing_start:
+            self.on_failure()
+            return self._send_empty(500)
+
+        body = SOURCE[start:end + 1]
+        self.send_response(206)
+        self.send_header('Content-Range', f'bytes {start}-{end}/{len(SOURCE)}')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@unittest.skipIf(async_downloader.aiohttp is None, "aiohttp not installed")
+class TestAsyncDownloader(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.output = os.path.join(self.temp_dir, "download.bin")
+
+        # A fresh handler class per test so settings don't leak between tests
+        self.handler = type('Handler', (RangeHandler,), {})
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), self.handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir)
+
+    def _downloader(self) -> AsyncDownloader:
+        return AsyncDownloader(
+            url=f"http://localhost:{self.server.server_port}/file.bin",
+            output_path=self.output,
+            num_connections=4,
+            chunk_size=CHUNK_SIZE,
+            config_file=os.path.join(self.temp_dir, "config.json")
+        )
+
+    def test_download_is_byte_identical(self):
+        """Test a parallel download reproduces the served file exactly"""
+        print("Testing async download...")
+
+        self.assertTrue(asyncio.run(self._downloader().run()))
+
+        with open(self.output, 'rb') as f:
+            self.assertEqual(f.read(), SOURCE)
+        self.assertFalse(os.path.exists(self.output + '.tmp'))
+        print("✅ Async download test passed")
+
+    def test_unavailable_server_fails_cleanly(self):
+        """Test a server answering 503 to everything makes run() return False without leftovers"""
+        print("Testing unavailable server...")
+
+        self.handler.error_status = 503
+
+        self.assertFalse(asyncio.run(self._downloader().run()))
+        self.assertFalse(os.path.exists(self.output))
+        self.assertFalse(os.path.exists(self.output + '.tmp'))
+        print("✅ Unavailable server test passed")
+
+    def test_cancelled_workers_finish_their_writes(self):
+        """Test writes still running when a failed chunk cancels the workers end before the output closes"""
+        print("Testing cancelled workers...")
+
+        failed = threading.Event()
+        lock = threading.Lock()
+        writes = {'running': 0, 'started': 0, 'errors': []}
+
+        def slow_pwritev(fd, buffers, offset):
+            with lock:
+                writes['running'] += 1
+                writes['started'] += 1
+            # Hold every write until the failing chunk was answered, so
+            # the other workers are cancelled in the middle of it
+            failed.wait(10)
+            time.sleep(0.2)
+            try:
+                pwritev(fd, buffers, offset)
+            except OSError as e:
+                writes['errors'].append(e)
+            finally:
+                with lock:
+                    writes['running'] -= 1
+
+        class NoRetryChunkManager(ChunkManager):
+            """Give up on a chunk after its first failure"""
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.max_retries = 0
+
+        # Chunk 4 is the first chunk of worker 1, so it fails while the
+        # other workers are still writing their first chunks
+        self.handler.failing_start = 4 * CHUNK_SIZE
+        self.handler.on_failure = staticmethod(failed.set)
+
+        downloader = self._downloader()
+        close = downloader.output.close
+        running_at_close = []
+
+        def checked_close():
+            running_at_close.append(writes['running'])
+            close()
+
+        downloader.output.close = checked_close
+
+        with patch.object(async_downloader, 'pwritev', slow_pwritev), \
+                patch.object(async_downloader, 'ChunkManager', NoRetryChunkManager):
+            self.assertFalse(asyncio.run(downloader.run()))
+
+        self.assertTrue(failed.is_set())
+        self.assertGreater(writes['started'], 0)
+        self.assertEqual(running_at_close, [0])
+        self.assertEqual(writes['errors'], [])
+        self.assertFalse(os.path.exists(self.output + '.tmp'))
+        print("✅ Cancelled workers test passed")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,113 @@
+import unittest
+import os
+import sys
+
+# Add the project root to the Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.core.chunk_manager import ChunkManager
+
+
+class TestChunkManager(unittest.TestCase):
+
+    def test_chunks_handed_out_once(self):
+        """Test every chunk is handed out exactly once"""
+        print("Testing chunk distribution...")
+
+        manager = ChunkManager(total_size=4000, chunk_size=1000, num_connections=4)
+
+        handed_out = []
+        while True:
+            chunk_range = manager.get_next_range(1000)
+            if not chunk_range:
+                break
+            handed_out.append(chunk_range)
+
+        self.assertEqual(handed_out, [
+            ([0], 0, 999), ([1], 1000, 1999), ([2], 2000, 2999), ([3], 3000, 3999)
+        ])
+        print("✅ Chunk distribution test passed")
+
+    def test_tail_is_split_into_chunks(self):
+        """Test files larger than num_connections * chunk_size are fully covered"""
+        print("Testing chunk calculation...")
+
+        manager = ChunkManager(total_size=4500, chunk_size=1000, num_connections=2)
+
+        self.assertEqual(manager.chunks, [
+            (0, 999), (1000, 1999), (2000, 2999), (3000, 3999), (4000, 4499)
+        ])
+        print("✅ Chunk calculation test passed")
+
+    def test_next_range_merges_adjacent_chunks(self):
+        """Test a range request claims adjacent chunks up to max_bytes"""
+        print("Testing range claiming...")
+
+        manager = ChunkManager(total_size=8000, chunk_size=1000, num_connections=2)
+
+        self.assertEqual(manager.get_next_range(3000), ([0, 1, 2], 0, 2999))
+        self.assertEqual(manager.get_next_range(500), ([3], 3000, 3999))
+        # Own queue is empty: steal from the back of worker 1's queue,
+        # capped at an equal share of the 4 remaining chunks
+        self.assertEqual(manager.get_next_range(10000), ([6, 7], 6000, 7999))
+        self.assertEqual(manager.get_next_range(10000, worker_id=1), ([4], 4000, 4999))
+        self.assertEqual(manager.get_next_range(10000), ([5], 5000, 5999))
+        self.assertIsNone(manager.get_next_range(10000))
+        print("✅ Range claiming test passed")
+
+    def test_failed_chunk_is_retried(self):
+        """Test a failed chunk is requeued until retries run out"""
+        print("Testing chunk retry...")
+
+        manager = ChunkManager(total_size=1000, chunk_size=1000, num_connections=1)
+        manager.max_retries = 1
+
+        (chunk_id,), _, _ = manager.get_next_range(1000)
+        manager.mark_chunk_failed(chunk_id)
+        self.assertEqual(manager.get_next_range(1000), ([0], 0, 999))
+
+        manager.mark_chunk_failed(chunk_id)
+        self.assertIsNone(manager.get_next_range(1000))
+        self.assertIn(chunk_id, manager.failed_chunks)
+        print("✅ Chunk retry test passed")
+
+    def test_failed_chunk_returns_to_home_queue(self):
+        """Test a retried chunk goes back to the worker whose slice it belongs to"""
+        print("Testing retry queue ownership...")
+
+        manager = ChunkManager(total_size=10000, chunk_size=1000, num_connections=4)
+        home = {
+            chunk_id: worker_id
+            for worker_id, queue in enumerate(manager.local_queues)
+            for chunk_id in queue
+        }
+
+        for queue in manager.local_queues:
+            queue.clear()
+        for chunk_id in range(10):
+            manager.mark_chunk_failed(chunk_id)
+
+        for worker_id, queue in enumerate(manager.local_queues):
+            self.assertEqual([home[chunk_id] for chunk_id in queue], [worker_id] * len(queue))
+        self.assertEqual(sum(len(queue) for queue in manager.local_queues), 10)
+        print("✅ Retry queue ownership test passed")
+
+    def test_all_chunks_completed(self):
+        """Test completion tracking"""
+        print("Testing completion tracking...")
+
+        manager = ChunkManager(total_size=2000, chunk_size=1000, num_connections=2)
+
+        for _ in range(2):
+            (chunk_id,), _, _ = manager.get_next_range(1000)
+            self.assertFalse(manager.all_chunks_completed())
+            manager.mark_chunk_completed(chunk_id)
+
+        self.assertTrue(manager.all_chunks_completed())
+        self.assertEqual(manager.get_progress(), 100)
+        print("✅ Completion tracking test passed")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
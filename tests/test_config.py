@@ -0,0 +1,190 @@
+import unittest
+import json
+import os
+import shutil
+import sys
+import tempfile
+from unittest.mock import patch
+
+# Add src to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils import config
+from utils.config import ConfigManager
+
+
+class TestConfigManager(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.config_file = os.path.join(self.temp_dir, "config.json")
+        ConfigManager._cache.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+        ConfigManager._cache.clear()
+
+    def _read_file(self) -> dict:
+        with open(self.config_file, encoding='utf-8') as f:
+            return json.loads(f.read())
+
+    def test_defaults_written_on_first_use(self):
+        """Test a missing config file is created with the defaults"""
+        print("Testing default config creation...")
+
+        manager = ConfigManager(self.config_file)
+
+        self.assertEqual(manager.get('timeout'), 30)
+        self.assertEqual(self._read_file(), dict(config._DEFAULT))
+        print("✅ Default config creation test passed")
+
+    def test_set_then_flush_persists(self):
+        """Test set() and update() reach the file on flush()"""
+        print("Testing flush...")
+
+        manager = ConfigManager(self.config_file)
+        manager.set('timeout', 60)
+        manager.update({'chunk_size': 2048, 'http2': True})
+        manager.flush()
+
+        on_disk = self._read_file()
+        self.assertEqual(on_disk['timeout'], 60)
+        self.assertEqual(on_disk['chunk_size'], 2048)
+        self.assertTrue(on_disk['http2'])
+        print("✅ Flush test passed")
+
+    def test_set_without_flush_does_not_persist(self):
+        """Test changes stay in memory until flushed"""
+        print("Testing unflushed changes...")
+
+        manager = ConfigManager(self.config_file)
+        manager.set('timeout', 60)
+
+        self.assertEqual(manager.get('timeout'), 60)
+        self.assertEqual(self._read_file()['timeout'], 30)
+        print("✅ Unflushed changes test passed")
+
+    def test_context_manager_flushes(self):
+        """Test leaving a with block persists pending changes"""
+        print("Testing context manager flush...")
+
+        with ConfigManager(self.config_file) as manager:
+            manager.set('timeout', 45)
+
+        self.assertEqual(self._read_file()['timeout'], 45)
+        print("✅ Context manager flush test passed")
+
+    def test_unchanged_file_reuses_cache(self):
+        """Test a second instance on an unchanged file doesn't parse it again"""
+        print("Testing parse cache reuse...")
+
+        with open(self.config_file, 'w') as f:
+            json.dump({'timeout': 12}, f)
+        ConfigManager(self.config_file)
+
+        with patch('utils.config.open', create=True, side_effect=AssertionError("file re-read")):
+            manager = ConfigManager(self.config_file)
+
+        self.assertEqual(manager.get('timeout'), 12)
+        self.assertEqual(manager.get('chunk_size'), config._DEFAULT['chunk_size'])
+        print("✅ Parse cache reuse test passed")
+
+    def test_external_rewrite_is_picked_up(self):
+        """Test a file rewritten by someone else is parsed again"""
+        print("Testing external rewrite...")
+
+        ConfigManager(self.config_file)
+        before = os.stat(self.config_file)
+
+        with open(self.config_file, 'w') as f:
+            json.dump({'timeout': 99}, f)
+        # Same timestamp tick as the cached write, as on a coarse filesystem
+        os.utime(self.config_file, ns=(before.st_atime_ns, before.st_mtime_ns))
+
+        self.assertEqual(ConfigManager(self.config_file).get('timeout'), 99)
+        print("✅ External rewrite test passed")
+
+    def test_replaced_file_is_picked_up(self):
+        """Test a same-size file moved into place within the same tick is parsed again"""
+        print("Testing replaced config file...")
+
+        with open(self.config_file, 'w') as f:
+            json.dump({'timeout': 11}, f)
+        ConfigManager(self.config_file)
+        before = os.stat(self.config_file)
+
+        replacement = self.config_file + '.new'
+        with open(replacement, 'w') as f:
+            json.dump({'timeout': 22}, f)
+        os.utime(replacement, ns=(before.st_atime_ns, before.st_mtime_ns))
+        os.replace(replacement, self.config_file)
+
+        self.assertEqual(ConfigManager(self.config_file).get('timeout'), 22)
+        print("✅ Replaced config file test passed")
+
+    def test_invalid_file_falls_back_to_defaults(self):
+        """Test a corrupt config file is ignored"""
+        print("Testing corrupt config...")
+
+        with open(self.config_file, 'w') as f:
+            f.write('{not json')
+
+        self.assertEqual(ConfigManager(self.config_file).get('timeout'), 30)
+        print("✅ Corrupt config test passed")
+
+    def _round_trip(self):
+        with ConfigManager(self.config_file) as manager:
+            manager.update({'timeout': 5, 'user_agent': 'Test/ü'})
+
+        ConfigManager._cache.clear()
+        manager = ConfigManager(self.config_file)
+        self.assertEqual(manager.get('timeout'), 5)
+        self.assertEqual(manager.get('user_agent'), 'Test/ü')
+        self.assertEqual(self._read_file()['user_agent'], 'Test/ü')
+
+    def test_stdlib_json(self):
+        """Test reading and writing without orjson"""
+        print("Testing stdlib json path...")
+
+        with patch.object(config, 'orjson', None):
+            self._round_trip()
+        print("✅ Stdlib json path test passed")
+
+    @unittest.skipUnless(config.orjson, "orjson not installed")
+    def test_both_paths_write_the_same_bytes(self):
+        """Test orjson and stdlib json write byte-identical files that either can read"""
+        print("Testing json path compatibility...")
+
+        written = {}
+        for name, module in (('orjson', config.orjson), ('json', None)):
+            with patch.object(config, 'orjson', module):
+                with ConfigManager(self.config_file) as manager:
+                    manager.set('user_agent', 'Test/ü')
+            with open(self.config_file, 'rb') as f:
+                written[name] = f.read()
+            os.remove(self.config_file)
+            ConfigManager._cache.clear()
+
+        self.assertEqual(written['orjson'], written['json'])
+        self.assertIn('ü'.encode('utf-8'), written['json'])
+
+        with open(self.config_file, 'wb') as f:
+            f.write(written['orjson'])
+        with patch.object(config, 'orjson', None):
+            self.assertEqual(ConfigManager(self.config_file).get('user_agent'), 'Test/ü')
+        print("✅ Json path compatibility test passed")
+
+    @unittest.skipUnless(config.orjson, "orjson not installed")
+    def test_orjson(self):
+        """Test reading and writing through orjson"""
+        print("Testing orjson path...")
+
+        with patch.object(config.json, 'load', side_effect=AssertionError("stdlib json used")), \
+                patch.object(config.json, 'dump', side_effect=AssertionError("stdlib json used")):
+            self._round_trip()
+        print("✅ orjson path test passed")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
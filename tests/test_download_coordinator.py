@@ -0,0 +1,146 @@
+import unittest
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from unittest.mock import MagicMock, patch
+
+# Add src to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from core.download_manager import DownloadManager
+from utils.file_ops import pwrite
+
+SOURCE = os.urandom(40 * 1024 + 123)
+CHUNK_SIZE = 4096
+
+
+class TestDownloadCoordinator(unittest.TestCase):
+    """Drives DownloadManager's workers and coordinator with a mocked HTTP client"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.output = os.path.join(self.temp_dir, "download.bin")
+        self.manager = DownloadManager(
+            url="https://example.com/file.bin",
+            output_path=self.output,
+            num_connections=4,
+            chunk_size=CHUNK_SIZE,
+            config_file=os.path.join(self.temp_dir, "config.json")
+        )
+        self.manager.http_client = MagicMock()
+        self.manager.http_client.get_file_size.return_value = len(SOURCE)
+        self.manager.http_client.download_chunk.side_effect = self._serve_range
+
+    def tearDown(self):
+        self.manager.stop_download()
+        shutil.rmtree(self.temp_dir)
+
+    @staticmethod
+    def _serve_range(url, fd, start_byte, end_byte=None):
+        """Stand-in for HTTPClient.download_chunk that writes from SOURCE"""
+        data = SOURCE[start_byte:None if end_byte is None else end_byte + 1]
+        pwrite(fd, data, start_byte)
+        return len(data)
+
+    def _run(self):
+        self.manager.start_download()
+        self.assertTrue(self.manager.done.wait(10), "download never finished")
+        self.manager.download_thread.join(10)
+        self.assertFalse(self.manager.download_thread.is_alive())
+
+    def test_parallel_download(self):
+        """Test every chunk is fetched once and the output moved into place"""
+        print("Testing coordinated download...")
+
+        self._run()
+
+        with open(self.output, 'rb') as f:
+            self.assertEqual(f.read(), SOURCE)
+        self.assertFalse(os.path.exists(self.output + '.tmp'))
+        self.assertTrue(self.manager.chunk_manager.all_chunks_completed())
+        info = self.manager.get_download_info()
+        self.assertEqual(info['progress_percentage'], 100)
+        self.assertFalse(info['is_downloading'])
+        print("✅ Coordinated download test passed")
+
+    def test_single_connection_fallback(self):
+        """Test a server without range support is fetched in one request"""
+        print("Testing single connection fallback...")
+
+        self.manager.http_client.get_file_size.return_value = None
+
+        self._run()
+
+        self.manager.http_client.download_chunk.assert_called_once()
+        with open(self.output, 'rb') as f:
+            self.assertEqual(f.read(), SOURCE)
+        print("✅ Single connection fallback test passed")
+
+    def test_failing_chunks_abort(self):
+        """Test chunks failing every retry stop the download without output"""
+        print("Testing permanent chunk failure...")
+
+        self.manager.http_client.download_chunk.side_effect = None
+        self.manager.http_client.download_chunk.return_value = None
+
+        self._run()
+
+        self.assertFalse(os.path.exists(self.output))
+        self.assertFalse(os.path.exists(self.output + '.tmp'))
+        self.assertTrue(self.manager.chunk_manager.failed_count)
+        print("✅ Permanent chunk failure test passed")
+
+    def test_crashed_workers_wake_the_coordinator(self):
+        """Test an exception escaping every worker loop ends the download instead of hanging"""
+        print("Testing crashed workers...")
+
+        with patch.object(self.manager, '_next_request_size', side_effect=RuntimeError("boom")), \
+                self.assertLogs(level='ERROR') as logs:
+            self._run()
+
+        self.assertTrue(self.manager.shutdown_event.is_set())
+        self.assertFalse(os.path.exists(self.output))
+        self.assertFalse(os.path.exists(self.output + '.tmp'))
+        self.assertTrue(any("Download worker failed: boom" in line for line in logs.output))
+        print("✅ Crashed workers test passed")
+
+    def test_stop_download_joins_in_flight_chunks(self):
+        """Test stop_download waits for running requests and discards the partial file"""
+        print("Testing stop_download...")
+
+        started = threading.Event()
+        release = threading.Event()
+        in_flight = []
+
+        def slow_range(url, fd, start_byte, end_byte=None):
+            in_flight.append(start_byte)
+            started.set()
+            release.wait(10)
+            written = self._serve_range(url, fd, start_byte, end_byte)
+            in_flight.remove(start_byte)
+            return written
+
+        self.manager.http_client.download_chunk.side_effect = slow_range
+        self.manager.start_download()
+        self.assertTrue(started.wait(10))
+
+        with self.assertLogs(level='INFO') as logs:
+            threading.Timer(0.2, release.set).start()
+            self.manager.stop_download()
+
+        self.assertEqual(in_flight, [])
+        self.assertTrue(self.manager.done.is_set())
+        self.assertFalse(self.manager.download_thread.is_alive())
+        self.assertFalse(os.path.exists(self.output))
+        self.assertFalse(os.path.exists(self.output + '.tmp'))
+        self.assertFalse([line for line in logs.output if line.startswith('ERROR')])
+        print("✅ stop_download test passed")
+
+
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO)
+    unittest.main(verbosity=2)
@@ -0,0 +1,188 @@
+import unittest
+import errno
+import os
+import random
+import stat
+import shutil
+import sys
+import tempfile
+from contextlib import contextmanager
+from unittest.mock import patch
+
+# Add src to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils import file_ops
+from utils.file_ops import FileMerger, PARALLEL_STAT_THRESHOLD
+
+
+@contextmanager
+def without(*names):
+    """Hide os functions, as on a platform that doesn't have them"""
+    saved = {name: getattr(os, name) for name in names if hasattr(os, name)}
+    for name in saved:
+        delattr(os, name)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(os, name, value)
+
+
+def wrap_method(name: str):
+    """Patch a FileMerger method with a spy that still runs the real one"""
+    return patch.object(FileMerger, name, autospec=True, side_effect=getattr(FileMerger, name))
+
+
+class TestFileMerger(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.output = os.path.join(self.temp_dir, "merged.bin")
+        self.random = random.Random(1234)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write_chunks(self, sizes):
+        """Write <output>.partN files of the given sizes, return them shuffled plus the expected merge"""
+        chunk_files = []
+        expected = bytearray()
+        for i, size in enumerate(sizes):
+            data = os.urandom(size)
+            path = f"{self.output}.part{i}"
+            with open(path, 'wb') as f:
+                f.write(data)
+            chunk_files.append(path)
+            expected += data
+
+        self.random.shuffle(chunk_files)
+        return chunk_files, bytes(expected)
+
+    def _merge_and_check(self, sizes, merger=None):
+        chunk_files, expected = self._write_chunks(sizes)
+        (merger or FileMerger()).merge_files(chunk_files, self.output)
+
+        with open(self.output, 'rb') as f:
+            self.assertEqual(f.read(), expected)
+        self.assertFalse(os.path.exists(self.output + '.tmp'))
+
+    def test_default_merge(self):
+        """Test chunks are merged in numeric, not lexical, order"""
+        print("Testing default merge...")
+
+        self._merge_and_check([70000, 1, 4096, 12345] * 3)
+        print("✅ Default merge test passed")
+
+    @unittest.skipUnless(hasattr(os, 'splice'), "splice(2) is Linux only")
+    def test_splice_tier(self):
+        """Test merging through splice when copy_file_range is unavailable"""
+        print("Testing splice merge...")
+
+        with without('copy_file_range'), patch('os.splice', wraps=os.splice) as spliced:
+            self._merge_and_check([70000, 1, 4096, 12345] * 3)
+        self.assertTrue(spliced.called)
+        print("✅ Splice merge test passed")
+
+    @unittest.skipUnless(hasattr(os, 'splice'), "splice(2) is Linux only")
+    def test_failing_output_splice_falls_through(self):
+        """Test bytes already in the pipe are copied again when splicing them out fails"""
+        print("Testing failing output splice...")
+
+        real_splice = os.splice
+        calls = []
+
+        def flaky_splice(src, dst, count, *args, **kwargs):
+            # Every third pipe-to-output splice fails
+            if stat.S_ISFIFO(os.fstat(src).st_mode):
+                calls.append(src)
+                if len(calls) % 3 == 0:
+                    raise OSError(errno.EINVAL, "Invalid argument")
+            return real_splice(src, dst, count, *args, **kwargs)
+
+        with without('copy_file_range'), patch('os.splice', side_effect=flaky_splice):
+            self._merge_and_check([200000, 3000, 150000, 77777] * 2, FileMerger(buffer_size=64 * 1024))
+        self.assertGreaterEqual(len(calls), 3)
+        print("✅ Failing output splice test passed")
+
+    @unittest.skipUnless(hasattr(os, 'sendfile'), "os.sendfile not available")
+    def test_sendfile_tier(self):
+        """Test merging through sendfile when neither copy_file_range nor splice is available"""
+        print("Testing sendfile merge...")
+
+        with without('copy_file_range', 'splice'), patch('os.sendfile', wraps=os.sendfile) as sent:
+            self._merge_and_check([70000, 1, 4096, 12345] * 3)
+        self.assertTrue(sent.called)
+        print("✅ Sendfile merge test passed")
+
+    def test_buffered_tier(self):
+        """Test the prefetching buffered copy used when no in-kernel copy exists"""
+        print("Testing buffered merge...")
+
+        with without('copy_file_range', 'splice', 'sendfile'), wrap_method('_copy_buffered') as copied:
+            self._merge_and_check([70000, 1, 4096, 12345] * 3, FileMerger(buffer_size=8192))
+        self.assertTrue(copied.called)
+        print("✅ Buffered merge test passed")
+
+    def test_mmap_tier(self):
+        """Test large chunks are copied through mmap when no in-kernel copy exists"""
+        print("Testing mmap merge...")
+
+        with without('copy_file_range', 'splice', 'sendfile'), \
+                patch.object(file_ops, 'MMAP_THRESHOLD', 4096), wrap_method('_copy_mapped') as mapped:
+            self._merge_and_check([70000, 1, 4096, 12345] * 3)
+        self.assertTrue(mapped.called)
+        print("✅ Mmap merge test passed")
+
+    @unittest.skipUnless(hasattr(os, 'O_DIRECT'), "O_DIRECT not available")
+    def test_direct_io(self):
+        """Test O_DIRECT merges, with the aligned middle written separately from head and tail"""
+        print("Testing O_DIRECT merge...")
+
+        sizes = [70000, 1, 4096, 12345] * 3
+        with wrap_method('_copy_direct') as direct:
+            self._merge_and_check(sizes, FileMerger(buffer_size=16384, direct_io=True))
+        self.assertTrue(direct.called)
+
+        # tmpfs and some other filesystems reject O_DIRECT: also run the
+        # aligned copy itself on a plain fd
+        with patch.object(os, 'O_DIRECT', 0):
+            self._merge_and_check(sizes, FileMerger(buffer_size=16384, direct_io=True))
+        print("✅ O_DIRECT merge test passed")
+
+    def test_parallel_stat(self):
+        """Test batches over PARALLEL_STAT_THRESHOLD are stat'ed on a pool and still merged in order"""
+        print("Testing parallel stat...")
+
+        with patch.object(file_ops, '_safe_stat', wraps=file_ops._safe_stat) as stated:
+            self._merge_and_check([self.random.randint(1, 5000) for _ in range(PARALLEL_STAT_THRESHOLD + 6)])
+        self.assertEqual(stated.call_count, PARALLEL_STAT_THRESHOLD + 6)
+        print("✅ Parallel stat test passed")
+
+    def test_missing_and_empty_chunks_are_skipped(self):
+        """Test missing and empty chunk files are left out of the merge"""
+        print("Testing missing chunk handling...")
+
+        chunk_files, expected = self._write_chunks([1000, 2000])
+        empty = f"{self.output}.part5"
+        open(empty, 'wb').close()
+
+        FileMerger().merge_files(chunk_files + [empty, f"{self.output}.part9"], self.output)
+
+        with open(self.output, 'rb') as f:
+            self.assertEqual(f.read(), expected)
+        print("✅ Missing chunk handling test passed")
+
+    def test_no_valid_chunks(self):
+        """Test merging nothing fails without leaving a temporary file"""
+        print("Testing merge without chunks...")
+
+        with self.assertRaises(ValueError):
+            FileMerger().merge_files([f"{self.output}.part0"], self.output)
+        self.assertFalse(os.path.exists(self.output))
+        print("✅ Merge without chunks test passed")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,107 @@
+import unittest
+import os
+import sys
+from unittest.mock import patch
+
+# Add src to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from core.progress_tracker import ProgressTracker
+
+SECOND = 1_000_000_000
+MIB = 1024 * 1024
+
+
+class TestProgressTracker(unittest.TestCase):
+
+    def _complete(self, tracker, chunk_id, size, start_ns, end_ns):
+        """Track one chunk from start_ns to end_ns on a patched monotonic clock"""
+        with patch('time.monotonic_ns', side_effect=[start_ns, end_ns]):
+            tracker.start_chunk_tracking(chunk_id)
+            tracker.update_progress(chunk_id, True, size)
+
+    def test_counts_and_bytes(self):
+        """Test completed and failed counts, progress and byte totals"""
+        print("Testing progress counts...")
+
+        tracker = ProgressTracker(4)
+        self.assertEqual(tracker.get_overall_progress(), 0.0)
+
+        self._complete(tracker, 0, 1000, SECOND, 2 * SECOND)
+        self._complete(tracker, 2, 500, SECOND, 2 * SECOND)
+        tracker.update_progress(3, False)
+
+        self.assertEqual(tracker.get_completed_chunks_count(), 2)
+        self.assertEqual(tracker.get_failed_chunks_count(), 1)
+        self.assertEqual(tracker.downloaded_bytes, 1500)
+        # Progress is measured over the chunks that have finished either way
+        self.assertAlmostEqual(tracker.get_overall_progress(), 200 / 3)
+        print("✅ Progress counts test passed")
+
+    def test_integer_speed_math(self):
+        """Test speeds are exact integer bytes/second from monotonic_ns"""
+        print("Testing speed math...")
+
+        tracker = ProgressTracker(3)
+        self._complete(tracker, 0, 4 * MIB, SECOND, 3 * SECOND)  # 2 MiB/s
+        self._complete(tracker, 1, 3, 5, 2 * SECOND + 5)  # 1.5 B/s, floored
+        self._complete(tracker, 2, 6 * MIB, 10 * SECOND, 10 * SECOND + SECOND // 2)  # 12 MiB/s
+
+        self.assertEqual(list(tracker.speeds), [2 * MIB, 1, 12 * MIB])
+        self.assertEqual(tracker.get_average_speed(), (14 * MIB + 1) / 3)
+        self.assertEqual(tracker.get_recent_speed(), (14 * MIB + 1) / 3)
+        # The start time is cleared once the chunk is done
+        self.assertEqual(list(tracker.start_times), [0, 0, 0])
+        print("✅ Speed math test passed")
+
+    def test_unmeasured_chunks(self):
+        """Test chunks without a start time or elapsed time record no speed"""
+        print("Testing unmeasured chunks...")
+
+        tracker = ProgressTracker(2)
+        tracker.update_progress(0, True, 1000)
+        self._complete(tracker, 1, 1000, 5 * SECOND, 5 * SECOND)
+
+        self.assertEqual(tracker.get_completed_chunks_count(), 2)
+        self.assertEqual(tracker.downloaded_bytes, 2000)
+        self.assertEqual(list(tracker.speeds), [0, 0])
+        self.assertEqual(tracker.get_average_speed(), 0.0)
+        self.assertEqual(tracker.get_recent_speed(), 0.0)
+        print("✅ Unmeasured chunks test passed")
+
+    def test_recent_speed_window(self):
+        """Test get_recent_speed only averages the latest requests"""
+        print("Testing recent speed window...")
+
+        tracker = ProgressTracker(10)
+        for chunk_id in range(10):
+            # Chunk n downloads at (n + 1) MiB/s; a start of 0 would mean untracked
+            self._complete(tracker, chunk_id, (chunk_id + 1) * MIB, 1, SECOND + 1)
+
+        self.assertEqual(tracker.get_recent_speed(), sum(range(3, 11)) * MIB / 8)
+        self.assertEqual(tracker.get_average_speed(), sum(range(1, 11)) * MIB / 10)
+        print("✅ Recent speed window test passed")
+
+    def test_reset(self):
+        """Test reset clears everything and resizes for the new chunk count"""
+        print("Testing reset...")
+
+        tracker = ProgressTracker(2)
+        self._complete(tracker, 0, 1000, SECOND, 2 * SECOND)
+        tracker.update_progress(1, False)
+
+        tracker.reset(5)
+
+        for values in (tracker.state, tracker.speeds, tracker.start_times, tracker.chunk_bytes):
+            self.assertEqual(len(values), 5)
+            self.assertFalse(any(values))
+        self.assertEqual(tracker.downloaded_bytes, 0)
+        self.assertEqual(tracker.get_completed_chunks_count(), 0)
+        self.assertEqual(tracker.get_failed_chunks_count(), 0)
+        self.assertEqual(tracker.get_recent_speed(), 0.0)
+        print("✅ Reset test passed")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,149 @@
+import unittest
+import io
+import os
+import sys
+import tempfile
+from unittest.mock import MagicMock
+
+# Add src to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from network.http_client import HTTPClient
+from network.range_request import check_range_response, parse_content_range
+
+SOURCE = bytes(range(256)) * 64  # 16 KiB of recognisable data
+
+
+class TestRangeResponse(unittest.TestCase):
+
+    def test_parse_content_range(self):
+        """Test Content-Range parsing"""
+        print("Testing Content-Range parsing...")
+
+        self.assertEqual(parse_content_range('bytes 0-999/1000'), (0, 999, 1000))
+        self.assertEqual(parse_content_range('bytes 0-999/*'), (0, 999, -1))
+        self.assertIsNone(parse_content_range(None))
+        self.assertIsNone(parse_content_range('bytes */1000'))
+        self.assertIsNone(parse_content_range('items 0-999/1000'))
+        print("✅ Content-Range parsing test passed")
+
+    def test_check_range_response(self):
+        """Test only a 206 for exactly the requested range is accepted"""
+        print("Testing range reply checks...")
+
+        self.assertTrue(check_range_response(206, {'Content-Range': 'bytes 100-199/1000'}, 100, 199))
+        self.assertTrue(check_range_response(200, {}, 0, None))
+        self.assertFalse(check_range_response(200, {}, 100, 199))
+        self.assertTrue(check_range_response(200, {}, 0, 199))
+        self.assertFalse(check_range_response(206, {}, 100, 199))
+        self.assertFalse(check_range_response(206, {'Content-Range': 'bytes 100-999/1000'}, 100, 199))
+        self.assertFalse(check_range_response(206, {'Content-Range': 'bytes 90-189/1000'}, 100, 199))
+        print("✅ Range reply check test passed")
+
+
+class TestHTTPClientDownloadChunk(unittest.TestCase):
+
+    def setUp(self):
+        self.client = HTTPClient(buffer_size=1000)
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        # Sentinel bytes stand in for chunks other workers already finished
+        with open(self.path, 'wb') as f:
+            f.write(b'\xff' * len(SOURCE))
+        self.fd = os.open(self.path, os.O_WRONLY)
+
+    def tearDown(self):
+        os.close(self.fd)
+        os.remove(self.path)
+
+    def _serve(self, body: bytes, content_range: str, status_code: int = 206):
+        """Make the session answer every GET with the given reply"""
+        response = MagicMock()
+        response.status_code = status_code
+        response.headers = {'Content-Range': content_range}
+        response.raw = io.BytesIO(body)
+        response.__enter__.return_value = response
+        self.client.session.get = MagicMock(return_value=response)
+
+    def _read_back(self) -> bytes:
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def test_exact_range(self):
+        """Test a well-formed 206 is written at its offset"""
+        print("Testing range download...")
+
+        self._serve(SOURCE[4096:8192], 'bytes 4096-8191/16384')
+
+        self.assertEqual(self.client.download_chunk('http://example.com/f', self.fd, 4096, 8191), 4096)
+        self.assertEqual(self._read_back()[4096:8192], SOURCE[4096:8192])
+        print("✅ Range download test passed")
+
+    def test_overlong_body_is_cut_at_range_end(self):
+        """Test surplus bytes in a 206 body never reach other chunks' regions"""
+        print("Testing overlong range body...")
+
+        self._serve(SOURCE[4096:], 'bytes 4096-8191/16384')
+
+        self.assertEqual(self.client.download_chunk('http://example.com/f', self.fd, 4096, 8191), 4096)
+        written = self._read_back()
+        self.assertEqual(written[4096:8192], SOURCE[4096:8192])
+        self.assertEqual(written[8192:], b'\xff' * 8192)
+        print("✅ Overlong range body test passed")
+
+    def test_overlong_content_range_is_rejected(self):
+        """Test a 206 covering start-EOF instead of the requested range writes nothing"""
+        print("Testing overlong Content-Range...")
+
+        self._serve(SOURCE[4096:], 'bytes 4096-16383/16384')
+
+        self.assertIsNone(self.client.download_chunk('http://example.com/f', self.fd, 4096, 8191))
+        self.assertEqual(self._read_back(), b'\xff' * len(SOURCE))
+        print("✅ Overlong Content-Range test passed")
+
+    def test_shifted_content_range_is_rejected(self):
+        """Test a 206 for a shifted range writes nothing"""
+        print("Testing shifted Content-Range...")
+
+        self._serve(SOURCE[4086:8182], 'bytes 4086-8181/16384')
+
+        self.assertIsNone(self.client.download_chunk('http://example.com/f', self.fd, 4096, 8191))
+        self.assertEqual(self._read_back(), b'\xff' * len(SOURCE))
+        print("✅ Shifted Content-Range test passed")
+
+    def test_ignored_range_from_start(self):
+        """Test a 200 to a range starting at 0 keeps just the requested bytes"""
+        print("Testing ignored range from byte 0...")
+
+        self._serve(SOURCE, None, status_code=200)
+
+        self.assertEqual(self.client.download_chunk('http://example.com/f', self.fd, 0, 4095), 4096)
+        written = self._read_back()
+        self.assertEqual(written[:4096], SOURCE[:4096])
+        self.assertEqual(written[4096:], b'\xff' * (len(SOURCE) - 4096))
+        print("✅ Ignored range from byte 0 test passed")
+
+    def test_ignored_range_elsewhere_is_rejected(self):
+        """Test a 200 to a range starting past 0 writes nothing"""
+        print("Testing ignored range past byte 0...")
+
+        self._serve(SOURCE, None, status_code=200)
+
+        self.assertIsNone(self.client.download_chunk('http://example.com/f', self.fd, 4096, 8191))
+        self.assertEqual(self._read_back(), b'\xff' * len(SOURCE))
+        print("✅ Ignored range past byte 0 test passed")
+
+    def test_whole_file_without_range(self):
+        """Test the single-connection path still reads to the end"""
+        print("Testing whole-file download...")
+
+        self._serve(SOURCE, None, status_code=200)
+
+        self.assertEqual(self.client.download_chunk('http://example.com/f', self.fd, 0), len(SOURCE))
+        self.assertEqual(self._read_back(), SOURCE)
+        print("✅ Whole-file download test passed")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,88 @@
+import unittest
+import os
+import sys
+
+# Add src to path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(project_root, 'src'))
+
+from utils.validators import URLValidator, MAX_URL_LENGTH
+
+LABEL_63 = 'a' * 63
+LABEL_64 = 'a' * 64
+# 4 * 63 labels + 3 dots = 255 characters, trimmed to 253 and 254
+HOST_253 = '.'.join([LABEL_63] * 4)[:253]
+HOST_254 = '.'.join([LABEL_63] * 4)[:254]
+
+DOMAIN_CASES = [
+    ('example.com', True),
+    ('localhost', True),
+    ('a.b.c.d.e', True),
+    ('xn--bcher-kva.example', True),
+    ('my-host.example.com', True),
+    ('127.0.0.1', True),
+    ('example.com:8080', True),
+    (f'{LABEL_63}.com', True),
+    (f'{LABEL_64}.com', False),
+    (HOST_253, True),
+    (HOST_254, False),
+    ('-example.com', False),
+    ('example-.com', False),
+    ('example.-com', False),
+    ('example.com-', False),
+    ('example..com', False),
+    ('.example.com', False),
+    ('example.com.', False),
+    ('', False),
+    (':8080', False),
+    ('exa_mple.com', False),
+    ('exa mple.com', False),
+    ('exämple.com', False),
+]
+
+URL_CASES = [
+    ('http://example.com/file.zip', True),
+    ('https://example.com/file.zip', True),
+    ('HTTPS://example.com/file.zip', True),
+    ('Http://example.com:8080/file.zip?x=1', True),
+    ('ftp://example.com/file.zip', False),
+    ('file:///etc/passwd', False),
+    ('httpx://example.com/', False),
+    ('http:/example.com/', False),
+    ('example.com/file.zip', False),
+    ('http://', False),
+    ('http://example..com/', False),
+    ('http://[::1/', False),
+    ('', False),
+    (None, False),
+    ('http://example.com/' + 'a' * (MAX_URL_LENGTH - len('http://example.com/')), True),
+    ('http://example.com/' + 'a' * (MAX_URL_LENGTH - len('http://example.com/') + 1), False),
+]
+
+
+class TestURLValidator(unittest.TestCase):
+
+    def setUp(self):
+        self.validator = URLValidator()
+
+    def test_domains(self):
+        """Test domain validation against label and length limits"""
+        print("Testing domain validation...")
+
+        for domain, expected in DOMAIN_CASES:
+            with self.subTest(domain=domain):
+                self.assertEqual(self.validator._is_valid_domain(domain), expected)
+        print("✅ Domain validation test passed")
+
+    def test_urls(self):
+        """Test the scheme and length fast path in front of urlparse"""
+        print("Testing URL validation...")
+
+        for url, expected in URL_CASES:
+            with self.subTest(url=url if url is None or len(url) < 80 else f'{len(url)}-char URL'):
+                self.assertEqual(self.validator.is_valid_url(url), expected)
+        print("✅ URL validation test passed")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)